@@ -26,7 +26,15 @@ class ConfigEverynet(BaseModel):
     token: str = ""
 
 
+class ConfigNetwork(BaseModel):
+    # Kernel socket buffer sizes; on Linux the effective value is capped by
+    # net.core.rmem_max / net.core.wmem_max.
+    udp_rcvbuf: int = 4 * 1024 * 1024
+    udp_sndbuf: int = 1 * 1024 * 1024
+
+
 class Config(BaseModel):
     traccar: ConfigTraccar = ConfigTraccar()
     mqtt: ConfigMqtt = ConfigMqtt()
     everynet: ConfigEverynet = ConfigEverynet()
+    network: ConfigNetwork = ConfigNetwork()
@@ -1,16 +1,23 @@
-import datetime
-import json
+import asyncio
 import logging
 import queue
-import random
+import secrets
 import socket
 import time
 from typing import Never
 
+import msgspec
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from lkt_utils.devices import EverynetDevice
 from paho.mqtt.client import Client
 from rich.panel import Panel
 
+from lkt_lns.configs import ConfigNetwork
 from lkt_lns.helpers import build_pull_resp, parse_uplink
 from lkt_lns.messages import (
     EveryNetMqttMessage,
@@ -21,6 +28,7 @@ from lkt_lns.messages import (
 from lkt_lns.packets import GatewayPacketType, Txpk
 
 TIME_STR = "%Y-%m-%d %H:%M:%S"
+DOWNLINK_GUARD = 0.05  # safety margin before the TX window (seconds)
 UDP_IP = "0.0.0.0"
 UPLINK_PORT = 1730  # uplink PUSH_DATA
 DOWNLINK_PORT = 1700  # downlink PULL_DATA
@@ -37,8 +45,8 @@ def downlink_response2downstream(
     new_message.meta.device_addr = device.dev_addr or ""
     new_message.meta.gateway = gateway
     new_message.meta.packet_hash = message.meta.packet_hash
-    new_message.meta.packet_id = random.randbytes(16).hex()
-    new_message.meta.time = datetime.datetime.now().timestamp()
+    new_message.meta.packet_id = secrets.token_hex(16)
+    new_message.meta.time = time.time()
     new_message.meta.outdated = False
 
     if not isinstance(message.params, ParamsDownlinkResponse):
@@ -47,44 +55,162 @@ def downlink_response2downstream(
     return {"status": "success"}
 
 
-def downstream_task(queue: queue.Queue[tuple[Txpk, int]], mqtt: Client) -> Never:
+def downstream_task(
+    queue: queue.Queue[tuple[Txpk, int]],
+    mqtt: Client,
+    network: ConfigNetwork | None = None,
+) -> Never:
+    network = network or ConfigNetwork()
     sock_down = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock_down.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, network.udp_rcvbuf)
+    sock_down.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, network.udp_sndbuf)
     sock_down.bind((UDP_IP, DOWNLINK_PORT))
     logging.info("[magenta]📡 Downstream thread started[/magenta]")
 
-    while True:
-        data, addr = sock_down.recvfrom(4096)  # pyright: ignore[reportAny]
-        _, token, ptype, gw_id, _ = parse_uplink(data)
-        now = int(time.time())
-        timestamp = datetime.datetime.fromtimestamp(now).strftime(TIME_STR)
+    # Reusable receive buffer: recvfrom_into avoids allocating a fresh 4 KiB
+    # bytes object per datagram.
+    recv_buf = bytearray(4096)
+    recv_view = memoryview(recv_buf)
 
-        logging.info(
-            f"{timestamp} 📥 Downlink from {addr}, 🔑 Token: {token.hex(':')}, 🏷️ Gateway: {gw_id}, 📦 Type: {ptype}"
-        )
+    while True:
+        nbytes, addr = sock_down.recvfrom_into(recv_buf)  # pyright: ignore[reportAny]
+        _, token, ptype, gw_id, _ = parse_uplink(bytes(recv_view[:nbytes]))
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            timestamp = time.strftime(TIME_STR, time.localtime())
+            logging.info(
+                "%s 📥 Downlink from %s, 🔑 Token: %s, 🏷️ Gateway: %s, 📦 Type: %s",
+                timestamp,
+                addr,
+                token.hex(":"),
+                gw_id.hex(),
+                ptype,
+            )
 
         if ptype == GatewayPacketType.PKT_TX_ACK:
             logging.debug("Downlink sent to device")
             continue
 
         while ptype == GatewayPacketType.PKT_PULL_DATA and not queue.empty():
-            time.sleep(0.1)
-            downlink, tmms = queue.get()
-            now = time.time()
-
-            delay = tmms - now
-            if 1 < delay:
-                queue.put((downlink, tmms))
-                continue
-            elif delay < 0:
+            downlink, tmms = queue.get_nowait()
+
+            wait = tmms - time.time() - DOWNLINK_GUARD
+            if wait > 1:
+                # Too early for this TX window: hand the downlink back and
+                # wait for the next PULL_DATA instead of polling in 100 ms
+                # steps.
+                queue.put_nowait((downlink, tmms))
+                break
+            elif wait < -DOWNLINK_GUARD:
                 logging.warning("Lost windows to send downlink")
                 continue
 
-            logging.info(
-                Panel(json.dumps(downlink, indent=2), title="TXPK JSON", style="purple")
-            )
+            if wait > 0:
+                time.sleep(wait)
+
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info(
+                    Panel(
+                        msgspec.json.format(
+                            msgspec.json.encode(downlink), indent=2
+                        ).decode(),
+                        title="TXPK JSON",
+                        style="purple",
+                    )
+                )
 
             downlink = build_pull_resp(bytearray(token), gw_id, downlink)
 
             _ = sock_down.sendto(downlink, addr)  # pyright: ignore[reportAny]
             logging.info("[bold green]📤 Downlink sent![/bold green]")
             break
+
+
+class DownstreamProtocol(asyncio.DatagramProtocol):
+    """Event-loop variant of :func:`downstream_task`.
+
+    ``datagram_received`` is called straight from the transport without a
+    per-packet ``recvfrom`` round-trip through Python, and pending downlinks
+    are scheduled with ``call_later`` instead of ``time.sleep``, so one
+    process keeps up with many more gateways.
+    """
+
+    def __init__(self, queue: queue.Queue[tuple[Txpk, int]]) -> None:
+        self.queue = queue
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        _, token, ptype, gw_id, _ = parse_uplink(data)
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            timestamp = time.strftime(TIME_STR, time.localtime())
+            logging.info(
+                "%s 📥 Downlink from %s, 🔑 Token: %s, 🏷️ Gateway: %s, 📦 Type: %s",
+                timestamp,
+                addr,
+                token.hex(":"),
+                gw_id.hex(),
+                ptype,
+            )
+
+        if ptype == GatewayPacketType.PKT_TX_ACK:
+            logging.debug("Downlink sent to device")
+            return
+
+        while ptype == GatewayPacketType.PKT_PULL_DATA and not self.queue.empty():
+            downlink, tmms = self.queue.get_nowait()
+
+            wait = tmms - time.time() - DOWNLINK_GUARD
+            if wait > 1:
+                self.queue.put_nowait((downlink, tmms))
+                break
+            elif wait < -DOWNLINK_GUARD:
+                logging.warning("Lost windows to send downlink")
+                continue
+
+            resp = build_pull_resp(bytearray(token), gw_id, downlink)
+            if wait > 0:
+                # Never block the event loop: schedule the send for the
+                # start of the TX window.
+                _ = asyncio.get_running_loop().call_later(
+                    wait, self._send, resp, addr
+                )
+            else:
+                self._send(resp, addr)
+            break
+
+    def _send(self, resp: bytes, addr: tuple[str, int]) -> None:
+        if self.transport is not None:
+            self.transport.sendto(resp, addr)
+            logging.info("[bold green]📤 Downlink sent![/bold green]")
+
+
+def downstream_task_async(
+    queue: queue.Queue[tuple[Txpk, int]],
+    mqtt: Client,
+    network: ConfigNetwork | None = None,
+) -> None:
+    """Run the downstream endpoint on an asyncio (uvloop when available) loop."""
+    _ = mqtt
+    network = network or ConfigNetwork()
+    if uvloop is not None:
+        uvloop.install()
+
+    async def serve() -> None:
+        sock_down = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock_down.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, network.udp_rcvbuf)
+        sock_down.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, network.udp_sndbuf)
+        sock_down.setblocking(False)
+        sock_down.bind((UDP_IP, DOWNLINK_PORT))
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: DownstreamProtocol(queue), sock=sock_down
+        )
+        logging.info("[magenta]📡 Downstream endpoint started[/magenta]")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            transport.close()
+
+    asyncio.run(serve())
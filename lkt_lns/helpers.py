@@ -1,12 +1,18 @@
 import base64
+import functools
 import struct
+import threading
 
-from Crypto.Cipher import AES
-from Crypto.Hash import CMAC
+import msgspec
 
+from cryptography.hazmat.primitives.ciphers import (
+    Cipher,
+    CipherContext,
+    algorithms,
+    modes,
+)
 from lkt_lns.packets import (
-    DOWNLINK_FREQUENCIES,
-    UPLINK_FREQUENCIES,
+    UPLINK_TO_DOWNLINK_FREQUENCY,
     Direction,
     GatewayPacketType,
     Rxpk,
@@ -14,8 +20,67 @@ from lkt_lns.packets import (
 )
 
 
+# One context cache per thread: a CipherContext wraps a single OpenSSL EVP
+# context and concurrent update() calls on it are not safe, so worker
+# threads each keep their own contexts instead of sharing an lru_cache.
+_ecb_contexts = threading.local()
+
+
+def ecb_encryptor(key: bytes) -> CipherContext:
+    """AES-ECB context cached per (thread, key) so the key schedule runs once.
+
+    ECB has no chaining state, so the context can be reused across calls
+    within a thread.
+    """
+    cache = getattr(_ecb_contexts, "by_key", None)
+    if cache is None:
+        cache = _ecb_contexts.by_key = {}
+    ctx = cache.get(key)
+    if ctx is None:
+        ctx = cache[key] = Cipher(algorithms.AES(key), modes.ECB()).encryptor()
+    return ctx
+
+
+def _shift_double(block: bytes) -> bytes:
+    """GF(2^128) doubling used for the CMAC subkey derivation (RFC 4493)."""
+    doubled = (int.from_bytes(block, "big") << 1) & ((1 << 128) - 1)
+    if block[0] & 0x80:
+        doubled ^= 0x87
+    return doubled.to_bytes(16, "big")
+
+
+@functools.lru_cache(maxsize=256)
+def _cmac_subkeys(key: bytes) -> tuple[bytes, bytes]:
+    k1 = _shift_double(ecb_encryptor(key).update(b"\x00" * 16))
+    return k1, _shift_double(k1)
+
+
+def aes_cmac(key: bytes, msg: bytes) -> bytes:
+    """AES-CMAC (RFC 4493) over cached subkeys and a cached ECB context.
+
+    The subkey derivation (one AES block plus two doublings) and the key
+    schedule are paid once per key instead of once per MIC.
+    """
+    k1, k2 = _cmac_subkeys(key)
+    aes = ecb_encryptor(key)
+    size = len(msg)
+    remainder = size % 16
+    if size and not remainder:
+        last_offset = size - 16
+        last = int.from_bytes(msg[last_offset:], "big") ^ int.from_bytes(k1, "big")
+    else:
+        last_offset = size - remainder
+        padded = msg[last_offset:] + b"\x80" + b"\x00" * (15 - remainder)
+        last = int.from_bytes(padded, "big") ^ int.from_bytes(k2, "big")
+    x = 0
+    for offset in range(0, last_offset, 16):
+        block = x ^ int.from_bytes(msg[offset : offset + 16], "big")
+        x = int.from_bytes(aes.update(block.to_bytes(16, "big")), "big")
+    return aes.update((x ^ last).to_bytes(16, "big"))
+
+
 def uplink_freq_to_downlink_freq(freq: float) -> float:
-    return float(DOWNLINK_FREQUENCIES[UPLINK_FREQUENCIES.index(f"{freq:.1f}")])
+    return UPLINK_TO_DOWNLINK_FREQUENCY[round(freq, 1)]
 
 
 def update_downlink(downlink: bytes, token: bytearray) -> bytes:
@@ -40,22 +105,24 @@ def lorawan_encrypt(
     """
     dev_addr_le = dev_addr[::-1]
     size = len(data)
-    s = b""
-    block_num = 1
-    while size > 0:
-        ai = (
-            b"\x01\x00\x00\x00\x00"
-            + struct.pack("<B", direction)
-            + dev_addr_le
-            + struct.pack("<I", fcnt)
-            + b"\x00"
-            + struct.pack("<B", block_num)
-        )
-        block = AES.new(application_session_key, AES.MODE_ECB).encrypt(ai)  # pyright: ignore[reportUnknownMemberType]
-        s += block[: min(16, size)]
-        size -= 16
-        block_num += 1
-    return bytes([d ^ s[i] for i, d in enumerate(data)])
+    n_blocks = (size + 15) // 16
+    prefix = (
+        b"\x01\x00\x00\x00\x00"
+        + bytes((direction,))
+        + dev_addr_le
+        + fcnt.to_bytes(4, "little")
+        + b"\x00"
+    )
+    ai = bytearray(n_blocks * 16)
+    for block_num in range(1, n_blocks + 1):
+        offset = (block_num - 1) * 16
+        ai[offset : offset + 15] = prefix
+        ai[offset + 15] = block_num
+    aes = ecb_encryptor(application_session_key)
+    s = aes.update(bytes(ai))[:size]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(s, "big")).to_bytes(
+        size, "big"
+    )
 
 
 def lorawan_mic(
@@ -65,45 +132,45 @@ def lorawan_mic(
     dev_addr_le = dev_addr[::-1]
     b0 = (
         b"\x49\x00\x00\x00\x00"
-        + struct.pack("<B", direction)
+        + bytes((direction,))
         + dev_addr_le
-        + struct.pack("<I", fcnt)
+        + fcnt.to_bytes(4, "little")
         + b"\x00"
-        + struct.pack("<B", len(msg))
+        + bytes((len(msg),))
     )
-    cmac = CMAC.new(network_session_key, ciphermod=AES)
-    _ = cmac.update(b0 + msg)
-    return cmac.digest()[:4]
+    return aes_cmac(network_session_key, b0 + msg)[:4]
 
 
 def build_p2p_downlink(cnt: int, lora_id: bytes, data: bytes) -> str:
-    payload_data = bytearray()
-    payload_data.extend(cnt.to_bytes(1, "little"))
-    payload_data.extend(lora_id)
-    payload_data.extend(data)
-    return base64.b64encode(payload_data).decode()
+    return base64.b64encode(bytes((cnt & 0xFF,)) + lora_id + data).decode()
 
 
 def lorawan_decrypt(
     payload: bytes, key: bytes, dev_addr: str, f_cnt: int, direction: int
 ):
-    aes = AES.new(key, AES.MODE_ECB)  # pyright: ignore[reportUnknownMemberType]
+    aes = ecb_encryptor(key)
     size = len(payload)
-    s_value = b""
-    i = 1
-    while len(s_value) < size:
-        ai = (
-            b"\x01\x00\x00\x00\x00"
-            + bytes([direction])
-            + bytes.fromhex(dev_addr)[::-1]
-            + f_cnt.to_bytes(4, "little")
-            + b"\x00"
-            + bytes([i])
-        )
-        si_value = aes.encrypt(ai)
-        s_value += si_value
-        i += 1
-    return bytes([a ^ b for a, b in zip(payload, s_value)])
+    n_blocks = (size + 15) // 16
+    prefix = (
+        b"\x01\x00\x00\x00\x00"
+        + bytes([direction])
+        + bytes.fromhex(dev_addr)[::-1]
+        + f_cnt.to_bytes(4, "little")
+        + b"\x00"
+    )
+    ai = bytearray(n_blocks * 16)
+    for i in range(1, n_blocks + 1):
+        offset = (i - 1) * 16
+        ai[offset : offset + 15] = prefix
+        ai[offset + 15] = i
+    s_value = aes.update(bytes(ai))[:size]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(s_value, "big")).to_bytes(
+        size, "big"
+    )
+
+
+# MHDR + DevAddr (LE) + FCtrl + FCnt + FPort
+_PHY_HEADER = struct.Struct("<B4sBHB")
 
 
 def build_lorawan_downlink(
@@ -120,64 +187,82 @@ def build_lorawan_downlink(
     nwk_session_key = bytes.fromhex(network_session_key_hex)
     app_session_key = bytes.fromhex(application_session_key_hex)
 
-    # MHDR (1 byte)
-    mhdr = b"\xa0" if confirmed else b"\x60"  # Confirmed=4, Unconfirmed=2 (downlink)
-
-    # FHDR (DevAddr LE + FCtrl + FCnt)
-    f_ctrl = 0x00
-    fhdr = dev_addr[::-1] + struct.pack("<B", f_ctrl) + struct.pack("<H", fcnt)
-
     # Encrypt payload
     frm_payload = lorawan_encrypt(
         app_session_key, dev_addr, fcnt, Direction.DOWN, payload
     )
 
-    # MACPayload = FHDR + FPort + FRMPayload
-    mac_payload = fhdr + struct.pack("<B", fport) + frm_payload
+    # PHYPayload = MHDR + FHDR (DevAddr LE + FCtrl + FCnt) + FPort +
+    # FRMPayload + MIC, assembled in a single preallocated buffer.
+    mic_offset = _PHY_HEADER.size + len(frm_payload)
+    phy = bytearray(mic_offset + 4)
+    mhdr = 0xA0 if confirmed else 0x60  # Confirmed=4, Unconfirmed=2 (downlink)
+    f_ctrl = 0x00
+    _PHY_HEADER.pack_into(phy, 0, mhdr, dev_addr[::-1], f_ctrl, fcnt, fport)
+    phy[_PHY_HEADER.size : mic_offset] = frm_payload
 
     # MIC
-    mic = lorawan_mic(nwk_session_key, dev_addr, fcnt, 1, mhdr + mac_payload)
+    phy[mic_offset:] = lorawan_mic(
+        nwk_session_key, dev_addr, fcnt, 1, bytes(phy[:mic_offset])
+    )
+    return base64.b64encode(bytes(phy)).decode()
 
-    # PHYPayload
-    phy = mhdr + mac_payload + mic
-    return base64.b64encode(phy).decode()
+
+@functools.lru_cache(maxsize=64)
+def _header_tail(pkt_type: GatewayPacketType, gateway_id: bytes) -> bytes:
+    return struct.pack("!B", pkt_type) + gateway_id
 
 
 def generate_header(
     version: bytes,
     token: bytearray,
     pkt_type: GatewayPacketType,
-    gateway_id: str,
+    gateway_id: bytes,
 ) -> bytes:
-    return version + token + struct.pack("!B", pkt_type) + bytes.fromhex(gateway_id)
+    # Only the token changes between packets; the type byte + gateway id
+    # tail is cached per gateway so each ACK is a single concatenation.
+    return version + token + _header_tail(pkt_type, gateway_id)
+
+
+_GW_HEADER = struct.Struct("!B2sB8s")
+
+# Reused codec instances: a Decoder/Encoder built once skips the per-call
+# type lookup done by msgspec.json.decode/encode.
+_RXPK_DECODER = msgspec.json.Decoder(Rxpk)
+_TXPK_ENCODER = msgspec.json.Encoder()
 
 
 def parse_uplink(
     data: bytes,
-) -> tuple[bytes, bytearray, GatewayPacketType, str, Rxpk | None]:
-    """Parse raw packet into header + JSON payload"""
-    version = data[0]
-    token = bytearray(data[1:3])
-    ptype = GatewayPacketType(data[3])
-    gateway_id = data[4:12].hex()
+) -> tuple[bytes, bytearray, GatewayPacketType, bytes, Rxpk | None]:
+    """Parse raw packet into header + JSON payload.
+
+    The gateway id stays as the raw 8 bytes; hex-encode it only at egress
+    (logging, upstream metadata).
+    """
+    version, token_raw, ptype_raw, gateway_id = _GW_HEADER.unpack_from(data)
+    token = bytearray(token_raw)
+    ptype = GatewayPacketType(ptype_raw)
 
+    # Only PUSH_DATA carries an rxpk JSON body; PULL_DATA/TX_ACK payloads
+    # would just burn a validation attempt per keepalive.
     payload = None
-    if len(data) > 12:
+    if ptype == GatewayPacketType.PKT_PUSH_DATA and len(data) > 12:
         try:
-            payload = Rxpk.model_validate_json(data[12:])
-        except Exception:
+            payload = _RXPK_DECODER.decode(data[12:])
+        except msgspec.DecodeError:
             payload = None
 
-    return bytes(version), token, ptype, gateway_id, payload
+    return bytes((version,)), token, ptype, gateway_id, payload
 
 
 def build_pull_resp(
     token: bytearray,
-    gateway_id: str,
+    gateway_id: bytes,
     downlink: Txpk,
 ) -> bytes:
     """Wrap LoRaWAN downlink in Semtech PULL_RESP."""
     version = b"\x02"
     pkt_type = b"\x03"  # PULL_RESP
-    header = version + token + pkt_type + bytes.fromhex(gateway_id)
-    return header + (downlink.model_dump_json().replace(" ", "")).encode()
+    header = version + token + pkt_type + gateway_id
+    return header + _TXPK_ENCODER.encode(downlink)
@@ -2,18 +2,19 @@ import base64
 import logging
 import struct
 
-from Crypto.Cipher import AES
-from Crypto.Hash import CMAC
-
+from lkt_lns.helpers import aes_cmac, ecb_encryptor
 from lkt_lns.packets import (
-    DOWNLINK_FREQUENCIES,
-    UPLINK_FREQUENCIES,
+    UPLINK_TO_DOWNLINK_FREQUENCY,
     Direction,
     Rxpk,
     Txpk,
 )
 
 
+# MHDR + DevAddr (LE) + FCtrl + FCnt + FPort
+_PHY_HEADER = struct.Struct("<B4sBHB")
+
+
 class LoRaWAN:
     @staticmethod
     def encrypt(
@@ -30,22 +31,24 @@ class LoRaWAN:
         """
         dev_addr_le = dev_addr[::-1]
         size = len(data)
-        s = b""
-        block_num = 1
-        while size > 0:
-            ai = (
-                b"\x01\x00\x00\x00\x00"
-                + struct.pack("<B", direction)
-                + dev_addr_le
-                + struct.pack("<I", fcnt)
-                + b"\x00"
-                + struct.pack("<B", block_num)
-            )
-            block = AES.new(application_session_key, AES.MODE_ECB).encrypt(ai)  # pyright: ignore[reportUnknownMemberType]
-            s += block[: min(16, size)]
-            size -= 16
-            block_num += 1
-        return bytes([d ^ s[i] for i, d in enumerate(data)])
+        n_blocks = (size + 15) // 16
+        prefix = (
+            b"\x01\x00\x00\x00\x00"
+            + bytes((direction,))
+            + dev_addr_le
+            + fcnt.to_bytes(4, "little")
+            + b"\x00"
+        )
+        ai = bytearray(n_blocks * 16)
+        for block_num in range(1, n_blocks + 1):
+            offset = (block_num - 1) * 16
+            ai[offset : offset + 15] = prefix
+            ai[offset + 15] = block_num
+        aes = ecb_encryptor(application_session_key)
+        s = aes.update(bytes(ai))[:size]
+        return (int.from_bytes(data, "big") ^ int.from_bytes(s, "big")).to_bytes(
+            size, "big"
+        )
 
     @staticmethod
     def decrypt(
@@ -55,23 +58,25 @@ class LoRaWAN:
         f_cnt: int,
         direction: int,
     ) -> bytes:
-        aes = AES.new(app_session_key, AES.MODE_ECB)  # pyright: ignore[reportUnknownMemberType]
+        aes = ecb_encryptor(app_session_key)
         size = len(payload)
-        s_value = b""
-        i = 1
-        while len(s_value) < size:
-            Ai = (
-                b"\x01\x00\x00\x00\x00"
-                + bytes([direction])
-                + bytes.fromhex(dev_addr)[::-1]
-                + f_cnt.to_bytes(4, "little")
-                + b"\x00"
-                + bytes([i])
-            )
-            si_value = aes.encrypt(Ai)
-            s_value += si_value
-            i += 1
-        return bytes([a ^ b for a, b in zip(payload, s_value)])
+        n_blocks = (size + 15) // 16
+        prefix = (
+            b"\x01\x00\x00\x00\x00"
+            + bytes([direction])
+            + bytes.fromhex(dev_addr)[::-1]
+            + f_cnt.to_bytes(4, "little")
+            + b"\x00"
+        )
+        Ai = bytearray(n_blocks * 16)
+        for i in range(1, n_blocks + 1):
+            offset = (i - 1) * 16
+            Ai[offset : offset + 15] = prefix
+            Ai[offset + 15] = i
+        s_value = aes.update(bytes(Ai))[:size]
+        return (
+            int.from_bytes(payload, "big") ^ int.from_bytes(s_value, "big")
+        ).to_bytes(size, "big")
 
     @staticmethod
     def mic(
@@ -85,19 +90,17 @@ class LoRaWAN:
         dev_addr_le = dev_addr[::-1]
         B0 = (
             b"\x49\x00\x00\x00\x00"
-            + struct.pack("<B", direction)
+            + bytes((direction,))
             + dev_addr_le
-            + struct.pack("<I", fcnt)
+            + fcnt.to_bytes(4, "little")
             + b"\x00"
-            + struct.pack("<B", len(msg))
+            + bytes((len(msg),))
         )
-        cmac = CMAC.new(network_session_key, ciphermod=AES)
-        _ = cmac.update(B0 + msg)
-        return cmac.digest()[:4]
+        return aes_cmac(network_session_key, B0 + msg)[:4]
 
     @staticmethod
     def downlink_freq(freq: float) -> float:
-        return float(DOWNLINK_FREQUENCIES[UPLINK_FREQUENCIES.index(f"{freq:.1f}")])
+        return UPLINK_TO_DOWNLINK_FREQUENCY[round(freq, 1)]
 
     @staticmethod
     def build_downlink(
@@ -114,29 +117,25 @@ class LoRaWAN:
         nwk_session_key = bytes.fromhex(network_session_key_hex)
         app_session_key = bytes.fromhex(application_session_key_hex)
 
-        # MHDR (1 byte)
-        mhdr = (
-            b"\xa0" if confirmed else b"\x60"
-        )  # Confirmed=4, Unconfirmed=2 (downlink)
-
-        # FHDR (DevAddr LE + FCtrl + FCnt)
-        f_ctrl = 0x00
-        fhdr = dev_addr[::-1] + struct.pack("<B", f_ctrl) + struct.pack("<H", fcnt)
-
         # Encrypt payload
         frm_payload = LoRaWAN.encrypt(
             app_session_key, dev_addr, fcnt, Direction.DOWN, payload
         )
 
-        # MACPayload = FHDR + FPort + FRMPayload
-        mac_payload = fhdr + struct.pack("<B", fport) + frm_payload
+        # PHYPayload = MHDR + FHDR (DevAddr LE + FCtrl + FCnt) + FPort +
+        # FRMPayload + MIC, assembled in a single preallocated buffer.
+        mic_offset = _PHY_HEADER.size + len(frm_payload)
+        phy = bytearray(mic_offset + 4)
+        mhdr = 0xA0 if confirmed else 0x60  # Confirmed=4, Unconfirmed=2 (downlink)
+        f_ctrl = 0x00
+        _PHY_HEADER.pack_into(phy, 0, mhdr, dev_addr[::-1], f_ctrl, fcnt, fport)
+        phy[_PHY_HEADER.size : mic_offset] = frm_payload
 
         # MIC
-        mic = LoRaWAN.mic(nwk_session_key, dev_addr, fcnt, 1, mhdr + mac_payload)
-
-        # PHYPayload
-        phy = mhdr + mac_payload + mic
-        return (base64.b64encode(phy).decode(), len(phy))
+        phy[mic_offset:] = LoRaWAN.mic(
+            nwk_session_key, dev_addr, fcnt, 1, bytes(phy[:mic_offset])
+        )
+        return (base64.b64encode(bytes(phy)).decode(), len(phy))
 
     @staticmethod
     def parse_downlink(
@@ -178,7 +177,10 @@ class LoRaWAN:
         # FRMPayload starts at index 9 and ends 4 bytes before the end (MIC)
         frm_payload_encrypted = phy_raw[fport_index + 1 : -4]
         logging.info(
-            f"[yellow]DevAddr in packet: {uplink_dev_addr_hex}, FCnt: {uplink_fcnt}, FPort: {uplink_fport}[/yellow]"
+            "[yellow]DevAddr in packet: %s, FCnt: %s, FPort: %s[/yellow]",
+            uplink_dev_addr_hex,
+            uplink_fcnt,
+            uplink_fport,
         )
 
         if not uplink_fport or not frm_payload_encrypted:
@@ -196,9 +198,11 @@ class LoRaWAN:
             uplink_fcnt,  # pyright: ignore[reportAny]
             Direction.UP.value,  # 0 for UP
         )
-        logging.info(
-            f"[bold green]Decrypted Application Payload (Hex)[/bold green]: {decrypted_payload.hex()}",
-        )
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(
+                "[bold green]Decrypted Application Payload (Hex)[/bold green]: %s",
+                decrypted_payload.hex(),
+            )
 
         fcnt += 1
 
@@ -1,24 +1,69 @@
-import abc
-import time
-from abc import abstractmethod
+import threading
+from collections import OrderedDict
 from enum import IntEnum, StrEnum
 from typing import Any, TypeAlias, override
 
-from lkt_utils.utils import try_bool, try_dict, try_float, try_int
+import msgspec
+import orjson
 
 
-class AbstractMqtt(abc.ABC):
-    def __init__(self):
-        pass
+def _i(data: dict[str, Any], key: str, default: int = 0) -> int:  # pyright: ignore[reportExplicitAny]
+    """Best-effort int read with a fast path for already-typed values."""
+    v = data.get(key)
+    if type(v) is int:
+        return v
+    try:
+        return default if v is None else int(v)  # pyright: ignore[reportAny]
+    except (TypeError, ValueError):
+        return default
+
+
+def _f(data: dict[str, Any], key: str, default: float = 0.0) -> float:  # pyright: ignore[reportExplicitAny]
+    """Best-effort float read with a fast path for already-typed values."""
+    v = data.get(key)
+    if type(v) is float:
+        return v
+    try:
+        return default if v is None else float(v)  # pyright: ignore[reportAny]
+    except (TypeError, ValueError):
+        return default
+
+
+def _b(data: dict[str, Any], key: str, default: bool = False) -> bool:  # pyright: ignore[reportExplicitAny]
+    """Best-effort bool read."""
+    v = data.get(key)
+    if type(v) is bool:
+        return v
+    return default if v is None else bool(v)
+
+
+# Shared read-only default for missing nested objects; callers must not
+# mutate what _d returns when the key is absent.
+_EMPTY: dict[str, Any] = {}  # pyright: ignore[reportExplicitAny]
+
+
+def _d(data: dict[str, Any], key: str, default: dict[str, Any] | None = None) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+    """Best-effort dict read."""
+    v = data.get(key)
+    if type(v) is dict:
+        return v
+    return default if default is not None else _EMPTY
+
+
+class AbstractMqtt(msgspec.Struct):
+    """Base for the MQTT message hierarchy.
+
+    msgspec.Struct gives every subclass a C-level constructor and a slots
+    layout (no per-instance ``__dict__``); the hand-written ``to_dict``/
+    ``from_dict`` pairs are kept so the wire format stays byte-identical.
+    """
 
-    @abstractmethod
     def to_dict(self) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
-        return {}
+        raise NotImplementedError
 
     @classmethod
-    @abstractmethod
     def from_dict(cls, data: dict[str, Any]) -> "AbstractMqtt":  # pyright: ignore[reportExplicitAny]
-        return cls()
+        raise NotImplementedError
 
 
 class MQTTPorts(IntEnum):
@@ -64,29 +109,16 @@ class TypeMessages(StrEnum):
         :raises: ValueError: If the message type is not recognized.
         """
 
-        match self:
-            case TypeMessages.DOWNLINK_REQUEST:
-                return ParamsDownlinkRequest
-            case TypeMessages.DOWNLINK_RESPONSE:
-                return ParamsDownlinkResponse
-            case TypeMessages.DOWNLINK:
-                return ParamsDownlink
-            case TypeMessages.UPLINK:
-                return ParamsUplink
-            case TypeMessages.ERROR:
-                return ParamsError
-            case _:
-                raise ValueError(f"Unknown message type: {self}")
+        try:
+            return _TYPE_TO_PARAMS[self]
+        except KeyError:
+            raise ValueError(f"Unknown message type: {self}") from None
 
 
 class ParamsDownlinkRequest(AbstractMqtt):
-    def __init__(
-        self, counter_down: int = 0, max_size: int = 0, tx_time: float = 0.0
-    ) -> None:
-        super().__init__()
-        self.counter_down: int = counter_down
-        self.max_size: int = max_size
-        self.tx_time: float = tx_time
+    counter_down: int = 0
+    max_size: int = 0
+    tx_time: float = 0.0
 
     @override
     def to_dict(self) -> dict[str, int | float]:
@@ -110,10 +142,8 @@ DictGPS = dict[str, float]
 
 
 class GPS(AbstractMqtt):
-    def __init__(self, lat: float, lng: float):
-        super().__init__()
-        self.lat: float = lat
-        self.lng: float = lng
+    lat: float = 0.0
+    lng: float = 0.0
 
     @override
     @classmethod
@@ -133,18 +163,10 @@ DictRadioModulation = dict[str, int | str]
 
 
 class RadioModulation(AbstractMqtt):
-    def __init__(
-        self,
-        bandwidth: int = 0,
-        type: str = "LORA",
-        coderate: str = "4/5",
-        spreading: int = 10,
-    ) -> None:
-        super().__init__()
-        self.bandwidth: int = bandwidth
-        self.type: str = type
-        self.coderate: str = coderate
-        self.spreading: int = spreading
+    bandwidth: int = 0
+    type: str = "LORA"
+    coderate: str = "4/5"
+    spreading: int = 10
 
     @override
     @classmethod
@@ -169,36 +191,25 @@ class RadioModulation(AbstractMqtt):
 
 
 class Hardware(AbstractMqtt):
-    def __init__(
-        self,
-        status: int = 0,
-        chain: int = 0,
-        tmst: int = 0,
-        snr: int = 0,
-        rssi: float = 0,
-        channel: int = 0,
-        gps: dict[str, float] | None = None,
-    ):
-        super().__init__()
-        self.status: int = int(status)
-        self.chain: int = int(chain)
-        self.tmst: int = int(tmst)
-        self.channel: int = int(channel)
-        self.snr: float = float(snr)
-        self.rssi: float = float(rssi)
-        self.gps: GPS = GPS.from_dict(gps or {})
+    status: int = 0
+    chain: int = 0
+    tmst: int = 0
+    channel: int = 0
+    snr: float = 0.0
+    rssi: float = 0.0
+    gps: GPS = msgspec.field(default_factory=GPS)
 
     @override
     @classmethod
     def from_dict(cls, data: DictHardware) -> "Hardware":
         return cls(
-            try_int(data, "status", 0),
-            try_int(data, "chain", 0),
-            try_int(data, "tmst", 0),
-            try_int(data, "snr", 0),
-            try_float(data, "rssi", 0.0),
-            try_int(data, "channel", 0),
-            gps=try_dict(data, "gps", {}),
+            _i(data, "status", 0),
+            _i(data, "chain", 0),
+            _i(data, "tmst", 0),
+            _i(data, "channel", 0),
+            _i(data, "snr", 0),
+            _f(data, "rssi", 0.0),
+            gps=GPS.from_dict(_d(data, "gps", _EMPTY)),
         )
 
     @override
@@ -218,27 +229,17 @@ DictRadio = dict[str, float | int | DictHardware | DictRadioModulation]
 
 
 class Radio(AbstractMqtt):
-    def __init__(
-        self,
-        freq: float = 0,
-        datarate: int = 0,
-        radio_time: float = 0,
-        hardware: Hardware | None = None,
-        modulation: RadioModulation | None = None,
-        gps_time: float | None = None,
-        delay: float | None = None,
-        size: int | None = None,
-    ) -> None:
-        super().__init__()
-        hardware = hardware or Hardware()
-        self.freq: float = freq
-        self.datarate: int = datarate
-        self.radio_time: float = radio_time
-        self.hardware: Hardware = hardware
-        self.modulation: RadioModulation | None = modulation
-        self.delay: float | None = delay
-        self.gps_time: float = gps_time or time.time()
-        self.size: int = size or 0
+    freq: float = 0.0
+    datarate: int = 0
+    radio_time: float = 0.0
+    # Lazy defaults: no Hardware/GPS allocation and no time.time() call per
+    # Radio when the caller fills them in anyway; to_dict/from_dict handle
+    # None.
+    hardware: Hardware | None = None
+    modulation: RadioModulation | None = None
+    gps_time: float | None = None
+    delay: float | None = None
+    size: int = 0
 
     @override
     def to_dict(
@@ -259,38 +260,30 @@ class Radio(AbstractMqtt):
     @classmethod
     def from_dict(cls, data: DictRadio) -> "Radio":
         return cls(
-            try_float(data, "freq", 0.0),
-            try_int(data, "datarate", 0),
-            try_float(data, "time", 0.0),
-            Hardware.from_dict(try_dict(data, "hardware", {})),
-            RadioModulation.from_dict(try_dict(data, "modulation", {})),
+            _f(data, "freq", 0.0),
+            _i(data, "datarate", 0),
+            _f(data, "time", 0.0),
+            Hardware.from_dict(_d(data, "hardware", _EMPTY)),
+            RadioModulation.from_dict(_d(data, "modulation", _EMPTY)),
         )
 
 
 DictParamsLoRa = dict[str, dict[str, bool | int] | list[dict[str, str]]]
 
+# Shared placeholder for the empty mac_commands list: serialized identically
+# to [{}] but not reallocated on every to_dict call.
+_EMPTY_MAC = ({},)
+
 
 class ParamsLoRa(AbstractMqtt):
-    def __init__(
-        self,
-        class_b: bool = False,
-        confirmed: bool = False,
-        adr: bool = False,
-        adr_ack_req: bool = False,
-        ack: bool = False,
-        version: int = 1,
-        lora_type: int = 2,
-        datarate: str = "SF12BW125",
-    ) -> None:
-        super().__init__()
-        self.class_b: bool = class_b
-        self.confirmed: bool = confirmed
-        self.adr: bool = adr
-        self.ack: bool = ack
-        self.adr_ack_req: bool = adr_ack_req
-        self.version: int = version
-        self.lora_type: int = lora_type
-        self.datarate: str = datarate
+    class_b: bool = False
+    confirmed: bool = False
+    adr: bool = False
+    adr_ack_req: bool = False
+    ack: bool = False
+    version: int = 1
+    lora_type: int = 2
+    datarate: str = "SF12BW125"
 
     @override
     @classmethod
@@ -301,13 +294,13 @@ class ParamsLoRa(AbstractMqtt):
         if not isinstance(header, dict):
             return cls()
         return cls(
-            try_bool(header, "class_b", False),
-            try_bool(header, "confirmed", False),
-            try_bool(header, "adr", False),
-            try_bool(header, "adr_ack_req", False),
-            try_bool(header, "ack", False),
-            try_int(header, "version", 1),
-            try_int(header, "lora_type", 2),
+            _b(header, "class_b", False),
+            _b(header, "confirmed", False),
+            _b(header, "adr", False),
+            _b(header, "adr_ack_req", False),
+            _b(header, "ack", False),
+            _i(header, "version", 1),
+            _i(header, "lora_type", 2),
             str(data.get("datarate", "SF12BW125")),
         )
 
@@ -323,7 +316,7 @@ class ParamsLoRa(AbstractMqtt):
                 "version": self.version,
                 "lora_type": self.lora_type,
             },
-            "mac_commands": [{}],
+            "mac_commands": _EMPTY_MAC,
         }
 
 
@@ -331,26 +324,14 @@ DictParamsUplink = dict[str, float | int | str | DictRadio | DictParamsLoRa]
 
 
 class ParamsUplink(AbstractMqtt):
-    def __init__(
-        self,
-        port: int = 0,
-        payload: str = "",
-        encrypted_payload: str = "",
-        rx_time: float = 0.0,
-        counter_up: int = 0,
-        radio: Radio | None = None,
-        duplicate: bool = False,
-        lora: ParamsLoRa | None = None,
-    ):
-        super().__init__()
-        self.port: int = port
-        self.payload: str = payload
-        self.encrypted_payload: str = encrypted_payload
-        self.rx_time: float = rx_time
-        self.counter_up: int = counter_up
-        self.radio: Radio | None = radio
-        self.duplicate: bool = duplicate
-        self.lora: ParamsLoRa | None = lora
+    port: int = 0
+    payload: str = ""
+    encrypted_payload: str = ""
+    rx_time: float = 0.0
+    counter_up: int = 0
+    radio: Radio | None = None
+    duplicate: bool = False
+    lora: ParamsLoRa | None = None
 
     @override
     def to_dict(self) -> DictParamsUplink:
@@ -372,12 +353,12 @@ class ParamsUplink(AbstractMqtt):
     @classmethod
     def from_dict(cls, data: DictParamsUplink) -> "ParamsUplink":
         return cls(
-            try_int(data, "port"),
+            _i(data, "port"),
             str(data.get("payload", "")),
             str(data.get("encrypted_payload", "")),
-            try_float(data, "rx_time"),
-            try_int(data, "counter_up"),
-            radio=Radio.from_dict(try_dict(data, "radio", {})),
+            _f(data, "rx_time"),
+            _i(data, "counter_up"),
+            radio=Radio.from_dict(_d(data, "radio", _EMPTY)),
         )
 
 
@@ -385,24 +366,13 @@ DictDownlink = dict[str, int | str | float]
 
 
 class ParamsDownlinkResponse(AbstractMqtt):
-    def __init__(
-        self,
-        pending: bool | None = False,
-        confirmed: bool | None = False,
-        counter_down: int | None = 0,
-        port: int | None = 1,
-        payload: str | None = "",
-        encrypted_payload: str | None = "",
-        queue_if_late: bool | None = False,
-    ):
-        super().__init__()
-        self.pending: bool = pending or False
-        self.confirmed: bool = confirmed or False
-        self.counter_down: int = counter_down or 0
-        self.port: int = port or 1
-        self.payload: str = payload or ""
-        self.encrypted_payload: str = encrypted_payload or ""
-        self.queue_if_late: bool = queue_if_late or False
+    pending: bool = False
+    confirmed: bool = False
+    counter_down: int = 0
+    port: int = 1
+    payload: str = ""
+    encrypted_payload: str = ""
+    queue_if_late: bool = False
 
     @override
     def to_dict(self) -> DictDownlink:
@@ -414,19 +384,20 @@ class ParamsDownlinkResponse(AbstractMqtt):
     @override
     @classmethod
     def from_dict(cls, data: DictDownlink) -> "ParamsDownlinkResponse":
-        inst = cls()
-        keys = inst.__dict__.keys()
-        for k in keys:
-            if not k.startswith("_") and k in data:
-                setattr(inst, k, data[k])
-        return inst
+        return cls(
+            pending=_b(data, "pending", False),
+            confirmed=_b(data, "confirmed", False),
+            counter_down=_i(data, "counter_down", 0),
+            port=_i(data, "port", 1),
+            payload=str(data.get("payload", "")),
+            encrypted_payload=str(data.get("encrypted_payload", "")),
+            queue_if_late=_b(data, "queue_if_late", False),
+        )
 
 
 class ParamsError(AbstractMqtt):
-    def __init__(self, message: str | None = None, code: int | None = None):
-        super().__init__()
-        self.message: str = message or ""
-        self.code: int = code or 0
+    message: str = ""
+    code: int = 0
 
     @override
     def to_dict(self) -> DictDownlink:
@@ -435,27 +406,18 @@ class ParamsError(AbstractMqtt):
     @override
     @classmethod
     def from_dict(cls, data: DictDownlink) -> "ParamsError":
-        return cls(str(data.get("message", "") or ""), try_int(data, "code"))
+        return cls(str(data.get("message", "") or ""), _i(data, "code"))
 
 
 DictHardwareRadio = dict[str, int | float]
 
 
 class HardwareRadio(AbstractMqtt):
-    def __init__(
-        self,
-        status: int = 0,
-        chain: int = 0,
-        power: float = 0,
-        tmst: int = 0,
-        channel: int = 0,
-    ):
-        super().__init__()
-        self.status: int = status
-        self.chain: int = chain
-        self.tmst: int = tmst
-        self.channel: int = channel
-        self.power: float = power
+    status: int = 0
+    chain: int = 0
+    power: float = 0.0
+    tmst: int = 0
+    channel: int = 0
 
     @override
     def to_dict(self) -> DictHardwareRadio:
@@ -470,11 +432,11 @@ class HardwareRadio(AbstractMqtt):
     @override
     @classmethod
     def from_dict(cls, data: DictHardwareRadio) -> "HardwareRadio":
-        chain = try_int(data, "chain", 0)
-        channel = try_int(data, "channel", 0)
-        status = try_int(data, "status", 0)
-        tmst = try_int(data, "tmst", 0)
-        power = try_float(data, "power", 0.0)
+        chain = _i(data, "chain", 0)
+        channel = _i(data, "channel", 0)
+        status = _i(data, "status", 0)
+        tmst = _i(data, "tmst", 0)
+        power = _f(data, "power", 0.0)
         return cls(status, chain, power, tmst, channel)
 
 
@@ -482,34 +444,25 @@ DictModulation = dict[str, int | str | bool]
 
 
 class Modulation(AbstractMqtt):
-    def __init__(
-        self,
-        bandwidth: int = 0,
-        modu: int = 0,
-        coderate: str = "",
-        spreading: int = 0,
-        inverted: bool = False,
-    ):
-        super().__init__()
-        self.bandwidth: int = bandwidth
-        self.modu: int = modu
-        self.spreading: int = spreading
-        self.coderate: str = coderate
-        self.inverted: bool = inverted
+    bandwidth: int = 0
+    modu: int = 0
+    spreading: int = 0
+    coderate: str = ""
+    inverted: bool = False
 
     @override
     @classmethod
     def from_dict(cls, data: DictModulation | None) -> "Modulation":
         """Create a Modulation object from a dict."""
         if data is None:
-            return cls(0, 0, "", 0, False)
+            return cls(0, 0, 0, "", False)
 
         return cls(
-            bandwidth=try_int(data, "bandwidth", 0),
-            modu=try_int(data, "type", 0),
-            spreading=try_int(data, "spreading", 0),
+            bandwidth=_i(data, "bandwidth", 0),
+            modu=_i(data, "type", 0),
+            spreading=_i(data, "spreading", 0),
             coderate=str(data.get("coderate", "") or ""),
-            inverted=try_bool(data, "inverted", False),
+            inverted=_b(data, "inverted", False),
         )
 
     @override
@@ -536,14 +489,8 @@ class RadioParams(AbstractMqtt):
     :attr modulation: (Modulation): Modulation parameters
     """
 
-    def __init__(
-        self,
-        hardware: HardwareRadio | None = None,
-        modulation: Modulation | None = None,
-    ):
-        super().__init__()
-        self.hardware: HardwareRadio = hardware or HardwareRadio()
-        self.modulation: Modulation = modulation or Modulation()
+    hardware: HardwareRadio = msgspec.field(default_factory=HardwareRadio)
+    modulation: Modulation = msgspec.field(default_factory=Modulation)
 
     @override
     def to_dict(self) -> DictRadioParams:
@@ -566,8 +513,8 @@ class RadioParams(AbstractMqtt):
             RadioParams: Radio parameters object
         """
         return cls(
-            HardwareRadio.from_dict(try_dict(data, "hardware", {})),
-            Modulation.from_dict(try_dict(data, "modulation", {})),
+            HardwareRadio.from_dict(_d(data, "hardware", _EMPTY)),
+            Modulation.from_dict(_d(data, "modulation", _EMPTY)),
         )
 
 
@@ -588,25 +535,13 @@ class ParamsDownlink(AbstractMqtt):
         payload (str): Payload of the downlink
     """
 
-    def __init__(
-        self,
-        freq: float | None = None,
-        datarate: str | None = None,
-        time: float | None = None,
-        payload: str | None = None,
-        encrypted_payload: str | None = None,
-        radio: RadioParams | None = None,
-        port: int | None = None,
-        counter_down: int | None = None,
-    ) -> None:
-        super().__init__()
-        self.freq: float = freq or 0
-        self.datarate: str = datarate or ""
-        self.time: float = time or 0
-        self.payload: str = payload or ""
-        self.encrypted_payload: str = encrypted_payload or ""
-        self.radio: RadioParams | None = radio
-        self.port: int = port or 0
+    freq: float = 0.0
+    datarate: str = ""
+    time: float = 0.0
+    payload: str = ""
+    encrypted_payload: str = ""
+    radio: RadioParams | None = None
+    port: int = 0
 
     @override
     def to_dict(
@@ -639,13 +574,13 @@ class ParamsDownlink(AbstractMqtt):
         :returns: ParamsDownlink object
         :rtype: ParamsDownlink
         """
-        radio_data = try_dict(data, "radio", {})
+        radio_data = _d(data, "radio", _EMPTY)
 
         return cls(
             radio=RadioParams.from_dict(radio_data) if radio_data else None,
-            freq=try_float(data, "freq", 0.0),
+            freq=_f(data, "freq", 0.0),
             datarate=str(data.get("datarate", "") or ""),
-            time=try_float(data, "time", 0.0),
+            time=_f(data, "time", 0.0),
             payload=str(data.get("payload", "")),
         )
 
@@ -660,19 +595,17 @@ class Meta(AbstractMqtt):
     Class to represent the meta information of a Everynet packet.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.application: str = ""
-        self.device: str = ""
-        self.device_addr: str = ""
-        self.gateway: str = ""
-        self.history: bool = False
-        self.network: str = ""
-        self.packet_hash: str = ""
-        self.packet_id: str = ""
-        self.version: int = 1
-        self.outdated: bool = False
-        self.time: float = 0.0
+    application: str = ""
+    device: str = ""
+    device_addr: str = ""
+    gateway: str = ""
+    history: bool = False
+    network: str = ""
+    packet_hash: str = ""
+    packet_id: str = ""
+    version: int = 1
+    outdated: bool = False
+    time: float = 0.0
 
     @override
     def to_dict(self) -> DictMeta:
@@ -700,15 +633,26 @@ class Meta(AbstractMqtt):
         """
         Creates an instance of Meta from a dictionary
 
+        Duplicate uplinks (same packet relayed by several gateways) carry
+        identical metadata, so results are cached by packet_id; callers must
+        treat the returned instance as read-only.
+
         :param data: (dict) Dictionary with Meta fields
 
         :return: Instance of Meta
         :rtype: Meta
 
         """
+        pid = str(data.get("packet_id", ""))
+        if pid:
+            with _META_CACHE_LOCK:
+                cached = _META_CACHE.get(pid)
+                if cached is not None:
+                    _META_CACHE.move_to_end(pid)
+                    return cached
         inst = cls()
-        inst.time = try_float(data, "time", 0.0)
-        inst.version = try_int(data, "version", 1)
+        inst.time = _f(data, "time", 0.0)
+        inst.version = _i(data, "version", 1)
         inst.network = str(data.get("network", ""))
         inst.packet_hash = str(data.get("packet_hash", ""))
         inst.application = str(data.get("application", ""))
@@ -716,27 +660,41 @@ class Meta(AbstractMqtt):
         inst.device = str(data.get("device", ""))
         inst.packet_id = str(data.get("packet_id", ""))
         inst.gateway = str(data.get("gateway", ""))
-        inst.history = try_bool(data, "history", False)
-        inst.outdated = try_bool(data, "outdated", False)
+        inst.history = _b(data, "history", False)
+        inst.outdated = _b(data, "outdated", False)
+        if pid:
+            with _META_CACHE_LOCK:
+                _META_CACHE[pid] = inst
+                if len(_META_CACHE) > _META_CACHE_MAX:
+                    _ = _META_CACHE.popitem(last=False)
         return inst
 
 
+# Bounded LRU of parsed Meta keyed by packet_id, shared across the MQTT
+# worker threads.
+_META_CACHE: OrderedDict[str, Meta] = OrderedDict()
+_META_CACHE_MAX = 4096
+_META_CACHE_LOCK = threading.Lock()
+
+
+# Message type -> params class, resolved once at import instead of a match
+# cascade per message.
+_TYPE_TO_PARAMS: dict[TypeMessages, type[AbstractMqtt]] = {
+    TypeMessages.DOWNLINK_REQUEST: ParamsDownlinkRequest,
+    TypeMessages.DOWNLINK_RESPONSE: ParamsDownlinkResponse,
+    TypeMessages.DOWNLINK: ParamsDownlink,
+    TypeMessages.UPLINK: ParamsUplink,
+    TypeMessages.ERROR: ParamsError,
+}
+
+
 DictMessage = dict[str, str | DictMeta | DictParamsDownlink | DictParamsUplink]
 
 
 class EveryNetMqttMessage(AbstractMqtt):
-    def __init__(
-        self,
-        type_message: TypeMessages = TypeMessages.ERROR,
-        meta: DictMeta | None = None,
-        params: DictParamsUplink | DictParamsDownlink | None = None,
-    ) -> None:
-        super().__init__()
-        params = params or {}
-        meta = meta or {}
-        self.type_message: TypeMessages = type_message
-        self.meta: Meta = Meta.from_dict(meta)
-        self.params: AbstractMqtt = type_message.to_type().from_dict(params)
+    type_message: TypeMessages = TypeMessages.ERROR
+    meta: Meta = msgspec.field(default_factory=Meta)
+    params: AbstractMqtt = msgspec.field(default_factory=ParamsError)
 
     @override
     def to_dict(self) -> DictMessage:
@@ -745,24 +703,37 @@ class EveryNetMqttMessage(AbstractMqtt):
 
         Returns:
             dict[str, Any]: EveryNet message as dict with typed values
-
-        Raises:
-            ValueError: If type_message is not one of the expected enum values
         """
+        # No membership check: type_message is typed TypeMessages and the
+        # from_dict path already validates via the enum constructor.
         message: DictMessage = {}
         message["type"] = self.type_message.value
-
-        if self.type_message not in TypeMessages:
-            raise ValueError(f"Unknown message type: {self.type_message}")
         message["meta"] = self.meta.to_dict()
         message["params"] = self.params.to_dict()
 
         return message
 
+    def to_json(self) -> bytes:
+        """Serialize straight to the MQTT wire format.
+
+        One C-level orjson pass over the to_dict output; publishers should
+        use this instead of json.dumps(message.to_dict()).
+        """
+        return orjson.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, buf: bytes | str) -> "EveryNetMqttMessage":
+        """Parse an MQTT payload without an intermediate json.loads caller."""
+        return cls.from_dict(orjson.loads(buf))
+
     @override
     @classmethod
     def from_dict(cls, data: DictMessage) -> "EveryNetMqttMessage":
         type_message = TypeMessages(data.get("type", ""))
-        meta: DictMeta = data.get("meta")  # pyright: ignore[reportAssignmentType]
-        params: DictParamsUplink | DictParamsDownlink = data.get("params")  # pyright: ignore[reportAssignmentType]
-        return cls(type_message, meta, params)
+        meta: DictMeta = data.get("meta") or {}  # pyright: ignore[reportAssignmentType]
+        params: DictParamsUplink | DictParamsDownlink = data.get("params") or {}  # pyright: ignore[reportAssignmentType]
+        return cls(
+            type_message,
+            Meta.from_dict(meta),
+            type_message.to_type().from_dict(params),
+        )
@@ -8,12 +8,11 @@ from lkt_lns.packets import Rxpk, Txpk
 class Peer2Peer:
     @staticmethod
     def build_downlink(cnt: int, lora_id: bytes, data: bytes) -> tuple[str, int]:
-        payload_data = bytearray()
-        payload_data.extend(cnt.to_bytes(1, "little"))
-        payload_data.extend(lora_id)
-        payload_data.extend(data)
-        # Return base64 encoded bytes and raw payload length
-        return base64.b64encode(payload_data).decode(), len(payload_data)
+        # Single concatenation instead of bytearray + three extends; base64
+        # output is ASCII by definition so decode("ascii") skips the utf-8
+        # scan. Return base64 encoded payload and raw payload length.
+        payload = bytes((cnt & 0xFF,)) + lora_id + data
+        return base64.b64encode(payload).decode("ascii"), len(payload)
 
     @staticmethod
     def parse_downlink(
@@ -26,14 +25,19 @@ class Peer2Peer:
         if len(raw) < 4:
             logging.warning("[red]Invalid[/red] P2P downlink")
             return
-        txpk = Txpk()
         cnt = raw[0]
         lora_id = raw[1:4]
-        txpk.tmst = rxpk.tmst + 1_000_000
-        txpk.tmms = (rxpk.tmms or 0) + 1
-        logging.info(f"P2P: cnt: {cnt}, lora_id: {lora_id}, data: {raw[4:].hex()}")
-        txpk.data, txpk.size = Peer2Peer.build_downlink(cnt, lora_id, payload)
-        txpk.freq = freq
-        txpk.datr = datarate
-        txpk.ipol = False
-        return txpk
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(
+                "P2P: cnt: %s, lora_id: %s, data: %s", cnt, lora_id, raw[4:].hex()
+            )
+        data, size = Peer2Peer.build_downlink(cnt, lora_id, payload)
+        return Txpk(
+            tmst=rxpk.tmst + 1_000_000,
+            tmms=(rxpk.tmms or 0) + 1,
+            freq=freq,
+            datr=datarate,
+            ipol=False,
+            size=size,
+            data=data,
+        )
@@ -1,7 +1,8 @@
 # keep your existing enums, helpers, and functions (not repeated here for brevity)
 import enum
 from typing import override
-from pydantic import BaseModel, Field
+
+import msgspec
 
 UDP_IP = "0.0.0.0"
 UPLINK_PORT = 1730  # uplink PUSH_DATA
@@ -41,14 +42,27 @@ class DataRate(enum.StrEnum):
     DR_13 = "SF7BW500"
 
     def get_bw(self) -> int:
-        return int(self.value.split("BW")[1]) * 1000
+        return _DATARATE_BW[self]
 
     def get_sf(self) -> int:
-        return int(self.value.split("BW")[0].split("SF")[1])
+        return _DATARATE_SF[self]
 
     @classmethod
     def from_str(cls, value: str) -> "DataRate":
-        return cls(value)
+        try:
+            return _DATARATE_BY_STR[value]
+        except KeyError:
+            # Same contract as cls(value): malformed gateway datr strings
+            # raise ValueError, not KeyError.
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}") from None
+
+
+# 14 members, parsed once at import: get_bw/get_sf run per packet and should
+# not re-split the identifier every call. DR_7/DR_8 share "SF12BW500", so the
+# value map is built over members, last writer wins (same as Enum aliasing).
+_DATARATE_BW = {dr: int(dr.value.split("BW")[1]) * 1000 for dr in DataRate}
+_DATARATE_SF = {dr: int(dr.value.split("BW")[0].split("SF")[1]) for dr in DataRate}
+_DATARATE_BY_STR = {dr.value: dr for dr in DataRate}
 
 
 class GatewayPacketType(enum.IntEnum):
@@ -64,80 +78,61 @@ class GatewayPacketType(enum.IntEnum):
         return self.name
 
 
-class Txpk(BaseModel):
-    imme: bool = Field(False, description="Immediate transmission flag")
-    tmst: int = Field(0, description="Internal timestamp of the packet (microseconds)")
-    tmms: int | None = Field(None, description="GPS time in milliseconds since epoch")
-    freq: float = Field(916.2, description="TX central frequency in MHz")
-    rfch: int = Field(0, description="Concentrator RF chain used for TX")
-    powe: int = Field(12, description="TX power in dBm")
-    datr: str = Field("SF10BW500", description="Datarate identifier (e.g., SF10BW125)")
-    modu: str = Field("LORA", description="Modulation type, e.g., LORA or FSK")
-    codr: str = Field("4/5", description="Coding rate identifier (e.g., 4/5)")
-    ipol: bool = Field(False, description="Invert the signal polarity")
-    size: int = Field(0, description="Size of the payload in bytes")
-    data: str = Field("", description="Payload data")
-
-    def __init__(
-        self,
-        imme: bool = False,
-        tmst: int = 0,
-        tmms: int = 0,
-        freq: float = 916.2,
-        rfch: int = 0,
-        powe: int = 12,
-        datr: str = "SF10BW500",
-        modu: str = "LORA",
-        codr: str = "4/5",
-        ipol: bool = False,
-        size: int = 0,
-        data: str = "",
-    ) -> None:
-        super().__init__(
-            imme=imme,
-            tmst=tmst,
-            tmms=tmms,
-            freq=freq,
-            rfch=rfch,
-            powe=powe,
-            datr=datr,
-            modu=modu,
-            codr=codr,
-            ipol=ipol,
-            size=size,
-            data=data,
-        )
-
-
-class Rxpk(BaseModel):
-    jver: int = Field(1, description="JSON version of the packet structure")
-    tmst: int = Field(
-        ..., description="Internal timestamp of the received packet (microseconds)"
-    )
-    tmms: int | None = Field(None, description="GPS time in milliseconds since epoch")
-    chan: int = Field(..., description="Concentrator IF channel used for RX")
-    rfch: int = Field(..., description="Concentrator RF chain used for RX")
-    freq: float = Field(..., description="RX central frequency in MHz")
-    mid: int = Field(..., description="Unique message identifier")
-    stat: int = Field(..., description="CRC status: 1 = OK, -1 = fail, 0 = no CRC")
-    modu: str = Field(..., description="Modulation type, e.g., LORA or FSK")
-    datr: str = Field(..., description="Datarate identifier (e.g., SF10BW125)")
-    codr: str = Field(..., description="Error coding rate (e.g., 4/5)")
-    rssis: float = Field(..., description="RSSI at antenna connector in dBm")
-    lsnr: float = Field(..., description="SNR in dB")
-    foff: int = Field(..., description="Frequency offset in Hz")
-    rssi: float = Field(..., description="RSSI in dBm")
-    size: int = Field(..., description="Payload size in bytes")
-    data: str = Field(..., description="Base64 encoded payload")
-
-
-class GatewayPacket(BaseModel):
-    rxpk: list[Rxpk] = Field(..., description="List of received packet(s)")
-
-
-class UplinkPacket(BaseModel):
-    rxpk: list[Rxpk] = Field(..., description="List of received packet(s)")
-
-
-UPLINK_FREQUENCIES = [f"{915.2 + i * 0.2:.1f}" for i in range(8)]
-DOWNLINK_FREQUENCIES = [f"{923.3 + i * 0.6:.1f}" for i in range(8)]
+# msgspec.Struct instead of pydantic BaseModel: these two are decoded/encoded
+# once per uplink/downlink, and msgspec's C codec skips pydantic's per-field
+# Python dispatch. UNSET on Txpk.tmms keeps it out of the PULL_RESP JSON
+# like exclude_none did, without omitting the fields the forwarder needs.
+
+
+class Txpk(msgspec.Struct):
+    imme: bool = False  # immediate transmission flag
+    tmst: int = 0  # internal timestamp of the packet (microseconds)
+    tmms: int | msgspec.UnsetType = msgspec.UNSET  # GPS time in ms since epoch
+    freq: float = 916.2  # TX central frequency in MHz
+    rfch: int = 0  # concentrator RF chain used for TX
+    powe: int = 12  # TX power in dBm
+    datr: str = "SF10BW500"  # datarate identifier (e.g., SF10BW125)
+    modu: str = "LORA"  # modulation type, e.g., LORA or FSK
+    codr: str = "4/5"  # coding rate identifier (e.g., 4/5)
+    ipol: bool = False  # invert the signal polarity
+    size: int = 0  # size of the payload in bytes
+    data: str = ""  # Base64 encoded payload
+
+
+class Rxpk(msgspec.Struct):
+    tmst: int  # internal timestamp of the received packet (microseconds)
+    chan: int  # concentrator IF channel used for RX
+    rfch: int  # concentrator RF chain used for RX
+    freq: float  # RX central frequency in MHz
+    mid: int  # unique message identifier
+    stat: int  # CRC status: 1 = OK, -1 = fail, 0 = no CRC
+    modu: str  # modulation type, e.g., LORA or FSK
+    datr: str  # datarate identifier (e.g., SF10BW125)
+    codr: str  # error coding rate (e.g., 4/5)
+    rssis: float  # RSSI at antenna connector in dBm
+    lsnr: float  # SNR in dB
+    foff: int  # frequency offset in Hz
+    rssi: float  # RSSI in dBm
+    size: int  # payload size in bytes
+    data: str  # Base64 encoded payload
+    jver: int = 1  # JSON version of the packet structure
+    tmms: int | None = None  # GPS time in milliseconds since epoch
+
+
+class GatewayPacket(msgspec.Struct):
+    rxpk: list[Rxpk]  # list of received packet(s)
+
+
+class UplinkPacket(msgspec.Struct):
+    rxpk: list[Rxpk]  # list of received packet(s)
+
+
+# Stored as floats (rounded to the channel grid) so nothing downstream has
+# to format-then-reparse them; format with f"{f:.1f}" where a string is
+# actually needed.
+UPLINK_FREQUENCIES = tuple(round(915.2 + i * 0.2, 1) for i in range(8))
+DOWNLINK_FREQUENCIES = tuple(round(923.3 + i * 0.6, 1) for i in range(8))
+
+# Uplink channel -> RX1 downlink channel, keyed by frequency rounded to one
+# decimal so the hot path is a dict lookup instead of a list scan.
+UPLINK_TO_DOWNLINK_FREQUENCY = dict(zip(UPLINK_FREQUENCIES, DOWNLINK_FREQUENCIES))
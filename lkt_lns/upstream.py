@@ -1,12 +1,18 @@
 import base64
-import datetime
+import functools
 import hashlib
-import json
+import itertools
 import logging
-import random
+import queue
+import secrets
 import socket
 import struct
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import msgspec
+import orjson
 
 from lkt_utils.devices import EverynetDevice
 from lkt_utils.everynet_http import EveryNetColumn, EveryNetHTTP
@@ -14,6 +20,7 @@ from paho.mqtt.client import Client
 
 from lkt_lns.messages import (
     EveryNetMqttMessage,
+    Hardware,
     ParamsLoRa,
     ParamsUplink,
     Radio,
@@ -23,6 +30,7 @@ from lkt_lns.messages import (
 
 from .helpers import generate_header
 from .lorawan import LoRaWAN
+from .net import BatchReceiver
 from .packets import (
     UDP_IP,
     UPLINK_PORT,
@@ -35,6 +43,11 @@ from .packets import (
 )
 
 
+def _b64_decoded_len(b64: str) -> int:
+    """Decoded length of a base64 string, without decoding it."""
+    return (len(b64) * 3) // 4 - b64.count("=", -2)
+
+
 def build_downlink(
     tmst: float,
     phy_b64: str,
@@ -60,7 +73,7 @@ def build_downlink(
             "datr": f"SF{sf}BW{bw}",
             "codr": "4/5",
             "ipol": ipol,  # p2p false, lrw true
-            "size": len(base64.b64decode(phy_b64)),
+            "size": _b64_decoded_len(phy_b64),
             "data": phy_b64,
         }
     }
@@ -69,8 +82,22 @@ def build_downlink(
     #    This is the crucial change.
     txpk_fields = packet_data["txpk"]
 
-    # NOTE: You can also use Txpk(**txpk_fields) if you don't need a specific Pydantic validation mode
-    return Txpk.model_validate(txpk_fields)
+    # NOTE: You can also use Txpk(**txpk_fields) if you don't need validation
+    return msgspec.convert(txpk_fields, Txpk)
+
+
+@functools.lru_cache(maxsize=1024)
+def _session_key_bytes(key_hex: str) -> bytes:
+    """Per-device session key bytes, decoded once per appskey."""
+    return bytes.fromhex(key_hex)
+
+
+_GW_HEADER = struct.Struct("!B2sB8s")
+_PID_FIELDS = struct.Struct("<qdd")  # tmst, freq, lsnr for the packet_id hash
+
+# Built once: a reused Decoder skips the per-call type lookup of
+# msgspec.json.decode.
+_UPLINK_DECODER = msgspec.json.Decoder(UplinkPacket)
 
 
 def parse_uplink(
@@ -79,23 +106,28 @@ def parse_uplink(
     bytes,
     bytearray,
     GatewayPacketType,
-    str,
+    bytes,
     UplinkPacket | None,
 ]:
-    """Parse raw packet into header + JSON payload"""
-    version = data[0]
-    token = bytearray(data[1:3])
-    ptype = GatewayPacketType(data[3])
-    gateway_id = data[4:12].hex()
+    """Parse raw packet into header + JSON payload.
+
+    The gateway id stays as the raw 8 bytes; hex-encode it only at egress
+    (logging, upstream metadata).
+    """
+    version, token_raw, ptype_raw, gateway_id = _GW_HEADER.unpack_from(data)
+    token = bytearray(token_raw)
+    ptype = GatewayPacketType(ptype_raw)
 
+    # Only PUSH_DATA carries an rxpk JSON body; PULL_DATA/TX_ACK payloads
+    # would just burn a validation attempt per keepalive.
     payload = None
-    if len(data) > 12:
+    if ptype == GatewayPacketType.PKT_PUSH_DATA and len(data) > 12:
         try:
-            payload = UplinkPacket.model_validate_json(data[12:])
-        except Exception:
+            payload = _UPLINK_DECODER.decode(data[12:])
+        except msgspec.DecodeError:
             payload = None
 
-    return bytes(version), token, ptype, gateway_id, payload
+    return bytes((version,)), token, ptype, gateway_id, payload
 
 
 def rxpk2everynet(
@@ -113,11 +145,15 @@ def rxpk2everynet(
     message.meta.application = device.app_eui or ""
     message.meta.device = device.dev_eui or ""
     message.meta.device_addr = device.dev_addr or ""
-    message.meta.time = datetime.datetime.now().timestamp()
-    message.meta.packet_id = hashlib.sha256(
-        rxpk.model_dump_json(exclude_none=True).encode()
-    ).hexdigest()[:16]
-    message.meta.packet_hash = random.randbytes(16).hex()
+    message.meta.time = time.time()
+    # 64-bit fingerprint over the identifying fields; no need to serialize
+    # the whole rxpk and truncate a SHA-256 for this.
+    pid = hashlib.blake2b(
+        _PID_FIELDS.pack(rxpk.tmst, rxpk.freq, rxpk.lsnr), digest_size=8
+    )
+    pid.update(rxpk.data.encode("ascii"))
+    message.meta.packet_id = pid.hexdigest()
+    message.meta.packet_hash = secrets.token_hex(16)
     message.params = ParamsUplink()
     message.params.payload = payload
     message.params.port = port
@@ -138,6 +174,7 @@ def rxpk2everynet(
     message.params.radio.modulation.spreading = datarate.get_sf()
     message.params.radio.modulation.type = rxpk.modu
 
+    message.params.radio.hardware = Hardware()
     message.params.radio.hardware.status = 1
     message.params.radio.hardware.chain = 0
     message.params.radio.hardware.tmst = rxpk.tmst
@@ -158,6 +195,79 @@ def rxpk2everynet(
     return message
 
 
+# The LoRa section of an uplink message is fully constant; shared, treat as
+# read-only.
+_LORA_PARAMS = {
+    "header": {
+        "class_b": False,
+        "confirmed": False,
+        "adr": False,
+        "adr_ack_req": False,
+        "ack": False,
+        "version": 1,
+        "lora_type": 2,
+    },
+    "mac_commands": ({},),
+}
+
+
+def build_everynet_dict(
+    rxpk: Rxpk,
+    gateway_id: str,
+    port: int,
+    counter: int,
+    device: EverynetDevice,
+    payload: str,
+) -> dict:  # pyright: ignore[reportMissingTypeArgument]
+    """Build the uplink wire dict directly.
+
+    Fast path for upstream_thread: same JSON shape as
+    rxpk2everynet(...).to_dict() without constructing and re-walking the
+    intermediate message objects. gateway_id is accepted for parity with
+    rxpk2everynet but, like there, never reaches the wire.
+    """
+    _ = gateway_id
+    datarate = DataRate.from_str(rxpk.datr)
+    return {
+        "type": TypeMessages.UPLINK.value,
+        "meta": {
+            "device": device.dev_eui or "",
+            "device_addr": device.dev_addr or "",
+            "application": device.app_eui or "",
+            "packet_hash": secrets.token_hex(16),
+        },
+        "params": {
+            "port": port,
+            "rx_time": rxpk.tmst,
+            "counter_up": counter,
+            "payload": payload,
+            "encrypted_payload": rxpk.data,
+            "duplicate": False,
+            "radio": {
+                "freq": rxpk.freq,
+                "datarate": 0,
+                "time": 0.0,
+                "hardware": {
+                    "status": 1,
+                    "chain": rxpk.rfch,
+                    "tmst": rxpk.tmst,
+                    "snr": rxpk.lsnr,
+                    "rssi": rxpk.rssi,
+                    "channel": rxpk.chan,
+                    "gps": {"lat": 0.0, "lng": 0.0},
+                },
+                "modulation": {
+                    "bandwidth": datarate.get_bw(),
+                    "type": rxpk.modu,
+                    "coderate": rxpk.codr,
+                    "spreading": datarate.get_sf(),
+                },
+            },
+            "lora": _LORA_PARAMS,
+        },
+    }
+
+
 def update_devices(everynet_http: EveryNetHTTP) -> dict[str, EverynetDevice]:
     """Fetch the current device mapping from Everynet."""
     try:
@@ -174,99 +284,113 @@ def upstream_thread(everynet_http: EveryNetHTTP, mqtt: Client, publish: str) ->
     sock_up = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock_up.bind((UDP_IP, UPLINK_PORT))
     sock_up.settimeout(60.0)
+    # 8 MB kernel buffer absorbs gateway bursts without tail drop; the
+    # effective size is capped by net.core.rmem_max, so log what we got.
+    sock_up.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+    rcvbuf = sock_up.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    if rcvbuf < 8 * 1024 * 1024:
+        logging.warning(
+            "SO_RCVBUF capped at %d bytes; raise sysctl net.core.rmem_max", rcvbuf
+        )
 
-    fcnt = 0
+    # itertools.count is atomic in CPython, so workers can draw downlink
+    # frame counters without a lock.
+    fcnt_counter = itertools.count(1)
     logging.info("[cyan]📡 Uplink thread started[/cyan]")
 
     devices = update_devices(everynet_http)
     logging.debug(list(devices.keys()))
-    last_update_time = time.time()
 
-    while True:
-        try:
-            data, addr = sock_up.recvfrom(4096)
-        except Exception as e:
-            logging.error(f"[red]❌ Socket error:[/red] {e}")
-            continue
+    # Refresh the device mapping off the receive path: the HTTP round-trip
+    # must not stall the UDP socket. The worker swaps the whole dict
+    # reference (atomic in CPython); a failed refresh keeps the last good
+    # mapping.
+    devices_ref = [devices]
 
-        try:
-            version, token_up, ptype, gw_id, payload = parse_uplink(data)
-        except Exception as e:
-            logging.warning(f"[yellow]⚠️ Failed to parse uplink:[/yellow] {e}")
-            continue
+    def _refresh_devices() -> None:
+        while True:
+            time.sleep(60)
+            devices_ref[0] = update_devices(everynet_http) or devices_ref[0]
 
-        # Refresh devices periodically even with normal traffic
-        if time.time() - last_update_time > 60:
-            devices = update_devices(everynet_http)
-            last_update_time = time.time()
+    threading.Thread(target=_refresh_devices, daemon=True).start()
 
-        if ptype != GatewayPacketType.PKT_PUSH_DATA:
-            continue
+    # Publishes go through a bounded queue drained by one dedicated thread:
+    # a slow broker backs the queue up instead of the uplink workers, and on
+    # overflow the message is dropped (it is QoS 0 anyway) rather than
+    # stalling packet processing.
+    publish_queue: queue.Queue[bytes] = queue.Queue(maxsize=1024)
 
-        # Send ACK
-        try:
-            _ = sock_up.sendto(
-                generate_header(
-                    version, token_up, GatewayPacketType.PKT_PUSH_ACK, gw_id
-                ),
-                addr,
-            )
-        except Exception as e:
-            logging.error(f"[red]❌ Failed to send ACK:[/red] {e}")
-            continue
+    def _publish_worker() -> None:
+        while True:
+            body = publish_queue.get()
+            err = mqtt.publish(publish, body, qos=0)
+            if err.rc != 0:
+                logging.error(f"MQTT publish error: {err.rc.name}")
 
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        logging.debug(
-            f"{now} 📤 Uplink from {addr}, 🔑 Token: {token_up.hex(':')}, 🏷️ Gateway: {gw_id}, 📦 Type: {ptype}"
-        )
+    threading.Thread(target=_publish_worker, daemon=True).start()
 
-        if not payload:
-            continue
+    def _process_push_data(payload: UplinkPacket, gw_id: bytes) -> None:
+        """Decrypt, build and publish one PUSH_DATA payload.
 
-        logging.debug(f"rxpk: {payload.model_dump_json(indent=2)}")
+        Runs on the worker pool so the receive thread stays on recvmmsg;
+        the cryptography AES backend releases the GIL, so decrypt overlaps
+        with RX on multi-core hosts.
+        """
+        devices = devices_ref[0]
+
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"rxpk: {msgspec.json.encode(payload).decode()}")
 
         rx = payload.rxpk[-1]
         freq = rx.freq
         tmst = rx.tmst
         tmms = rx.tmms
 
+        # Decode the payload once; both the P2P and LoRaWAN branches
+        # work on the same raw bytes.
+        phy_raw = base64.b64decode(rx.data)
+
         if freq < 903.5:
             # Handle P2P downlink
-            raw = base64.b64decode(rx.data)
+            raw = phy_raw
             if len(raw) < 4:
                 logging.error("[red]Invalid P2P downlink[/red]")
-                continue
+                return
             cnt = raw[0]
             lora_id = raw[1:4]
             tmst += 1_000_000
             tmms = (tmms or 0) + 1
-            logging.info(
-                f"P2P: cnt={cnt}, lora_id={lora_id.hex()}, data={raw[4:].hex()}"
-            )
-            continue
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info(
+                    f"P2P: cnt={cnt}, lora_id={lora_id.hex()}, data={raw[4:].hex()}"
+                )
+            return
 
         # LoRaWAN downlink
-        fcnt += 1
+        fcnt = next(fcnt_counter)
         freq = LoRaWAN.downlink_freq(freq)
 
-        phy_raw = base64.b64decode(rx.data)
-        uplink_dev_addr_hex = phy_raw[1:5][::-1].hex()  # little → big endian
         if len(phy_raw) < 10:
             logging.warning(f"[yellow]Invalid LoRaWAN packet length {len(phy_raw)}[/yellow]")
-            continue
-        uplink_fcnt = int(struct.unpack("<H", phy_raw[6:8])[0])  # pyright: ignore[reportAny]
+            return
+        mv = memoryview(phy_raw)
+        uplink_dev_addr_hex = mv[4:0:-1].tobytes().hex()  # little → big endian
+        uplink_fcnt = int.from_bytes(mv[6:8], "little")
         uplink_fport = phy_raw[8]
-        frm_payload_encrypted = phy_raw[9:-4]
+        frm_payload_encrypted = bytes(mv[9:-4])
 
         logging.info(
-            f"[yellow]DevAddr={uplink_dev_addr_hex}, FCnt={uplink_fcnt}, FPort={uplink_fport}[/yellow]"
+            "[yellow]DevAddr=%s, FCnt=%s, FPort=%s[/yellow]",
+            uplink_dev_addr_hex,
+            uplink_fcnt,
+            uplink_fport,
         )
 
         if not uplink_fport or not frm_payload_encrypted:
             logging.warning(
                 "[yellow]No application payload (FPort 0 or empty FRMPayload).[/yellow]"
             )
-            continue
+            return
 
         if uplink_dev_addr_hex not in devices:
             logging.warning(f"[yellow]Unknown device {uplink_dev_addr_hex}[/yellow]")
@@ -274,11 +398,11 @@ def upstream_thread(everynet_http: EveryNetHTTP, mqtt: Client, publish: str) ->
                 EveryNetColumn.DEVICE_ADDRESS, uplink_dev_addr_hex
             )
             if uplink_dev_addr_hex not in new_devices:
-                continue
+                return
             devices[uplink_dev_addr_hex] = new_devices[uplink_dev_addr_hex]
 
         device = devices[uplink_dev_addr_hex]
-        app_session_key_bytes = bytes.fromhex(device.appskey or "")
+        app_session_key_bytes = _session_key_bytes(device.appskey or "")
         decrypted_payload = LoRaWAN.decrypt(
             frm_payload_encrypted,
             app_session_key_bytes,
@@ -287,22 +411,77 @@ def upstream_thread(everynet_http: EveryNetHTTP, mqtt: Client, publish: str) ->
             Direction.UP.value,
         )
 
-        logging.debug(
-            f"[bold green]Decrypted Application Payload:[/bold green] {decrypted_payload.hex()}"
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                f"[bold green]Decrypted Application Payload:[/bold green] {decrypted_payload.hex()}"
+            )
 
-        fcnt += 1
+        fcnt = next(fcnt_counter)
         tmst += 5_000_000
         tmms = (tmms or 0) + 5
-        logging.debug(f"LoRaWAN: fcnt={fcnt}, freq={freq}, tmst={tmst}")
+        logging.debug("LoRaWAN: fcnt=%s, freq=%s, tmst=%s", fcnt, freq, tmst)
 
         decrypted_payload_b64 = base64.b64encode(decrypted_payload).decode()
 
-        everynet_msg = rxpk2everynet(
-            rx, gw_id, uplink_fport, fcnt, device, decrypted_payload_b64
-        ).to_dict()
+        everynet_msg = build_everynet_dict(
+            rx, gw_id.hex(), uplink_fport, fcnt, device, decrypted_payload_b64
+        )
+
+        try:
+            publish_queue.put_nowait(orjson.dumps(everynet_msg))
+        except queue.Full:
+            logging.warning("[yellow]Publish queue full, dropping uplink[/yellow]")
+
+    def _process_push_data_safe(payload: UplinkPacket, gw_id: bytes) -> None:
+        # Futures are fire-and-forget, so exceptions must be logged here or
+        # they vanish with the discarded future.
+        try:
+            _process_push_data(payload, gw_id)
+        except Exception as e:
+            logging.error(f"[red]❌ Uplink processing failed:[/red] {e}")
+
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="uplink")
+
+    receiver = BatchReceiver(sock_up)
+    while True:
+        try:
+            datagrams = receiver.recv()
+        except TimeoutError:
+            continue
+        except Exception as e:
+            logging.error(f"[red]❌ Socket error:[/red] {e}")
+            continue
+
+        for data, addr in datagrams:
+            try:
+                version, token_up, ptype, gw_id, payload = parse_uplink(data)
+            except Exception as e:
+                logging.warning(f"[yellow]⚠️ Failed to parse uplink:[/yellow] {e}")
+                continue
+
+            if ptype != GatewayPacketType.PKT_PUSH_DATA:
+                continue
+
+            # ACK first: the gateway retransmits on a late PUSH_ACK, so it
+            # goes out before any logging or payload handling.
+            try:
+                _ = sock_up.sendto(
+                    generate_header(
+                        version, token_up, GatewayPacketType.PKT_PUSH_ACK, gw_id
+                    ),
+                    addr,
+                )
+            except Exception as e:
+                logging.error(f"[red]❌ Failed to send ACK:[/red] {e}")
+                continue
+
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                now = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+                logging.debug(
+                    f"{now} 📤 Uplink from {addr}, 🔑 Token: {token_up.hex(':')}, 🏷️ Gateway: {gw_id.hex()}, 📦 Type: {ptype}"
+                )
+
+            if not payload:
+                continue
 
-        # logging.debug(f"Send {everynet_msg} at {datetime.datetime.now()} to {publish}")
-        err = mqtt.publish(publish, json.dumps(everynet_msg), qos=0)
-        if err.rc != 0:
-            logging.error(f"MQTT publish error: {err.rc.name}")
+            _ = executor.submit(_process_push_data_safe, payload, gw_id)